@@ -11,134 +11,348 @@ Design goals:
 from __future__ import annotations
 
 import asyncio
+import atexit
+import functools
 import hashlib
+import http.client
 import json
 import logging
 import os
-import urllib.error
+import tempfile
+import threading
+import time
+import urllib.parse
 import urllib.request
 import uuid
-from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+try:  # Optional: reuse a keep-alive connection between sends
+    import urllib3
+except ImportError:  # pragma: no cover - urllib3 not installed
+    urllib3 = None  # type: ignore[assignment]
+
+try:  # Optional: POST natively from the event loop without a thread hop
+    import aiohttp
+except ImportError:  # pragma: no cover - aiohttp not installed
+    aiohttp = None  # type: ignore[assignment]
+
 _DEFAULT_ENDPOINT = "https://telemetry.namelessnanashi.dev/census"
 _PROJECT_NAME = "<PROJECT_NAME>"
 _OPTOUT_ENV_VAR = "<PROJECT_ACRONYM>_TELEMETRY_OPTOUT"
 _HAS_SCHEDULED_SEND = False
 _PERIOD_HOURS = 2  # send every 2 hours (on the hour, UTC)
-_HAS_LOGGED_SCHEDULE = False
-_HAS_LOGGED_SKIP = False
-_HAS_LOGGED_NO_PROJECT = False
+_COALESCE_SECONDS = 300  # skip the startup send if a boundary send is this close
+_EXIT_JOIN_SECONDS = 3.0  # max wait at exit for a pending no-loop send
+# Per-process caches; the instance id and everything but the date are invariant
+_CACHED_RAW_ID: Optional[str] = None
+_CACHED_HASHED_ID: Optional[str] = None
+_LAST_SENT: dict = {}  # project -> last UTC date sent, from the state file
+_ID_PERSISTED = False  # id was read from / written to the state file (not ephemeral)
+_PAYLOAD_PREFIX: Optional[bytes] = None  # JSON up to the date value
+_PAYLOAD_SUFFIX: Optional[bytes] = None  # JSON after the date value
+_DATE_EPOCH_DAY = -1
+_DATE_STR_BYTES = b""
+_POOL = None  # urllib3.PoolManager, created lazily on first send
+_CONN: Optional[http.client.HTTPConnection] = None  # kept alive between sends
+_CONN_ADDR: Optional[tuple] = None  # (scheme, host, port) that _CONN points at
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+# Parent of the directory holding this module; it exists, so never needs creating
+_DEFAULT_STATE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+# Accepted boolean spellings for environment variables (compared lowercased)
+_BOOL_MAP = {
+    "1": True,
+    "true": True,
+    "yes": True,
+    "on": True,
+    "y": True,
+    "t": True,
+    "0": False,
+    "false": False,
+    "no": False,
+    "off": False,
+    "n": False,
+    "f": False,
+}
 
 _log = logging.getLogger("telemetry")
 
 
-def _env_truthy(v: Optional[str]) -> bool:
-    s = (v or "").strip().lower()
-    return s in ("1", "true", "yes", "on", "y", "t")
+def _dbg(msg: str, *args, **kwargs) -> None:
+    # Checked per call rather than at import: logging is usually configured later
+    if _log.isEnabledFor(logging.DEBUG):
+        _log.debug(msg, *args, **kwargs)
+
 
+@functools.lru_cache(maxsize=None)
+def _log_once(msg: str, *args) -> None:
+    """Log ``msg`` at info level once per distinct ``(msg, *args)``; repeats are cache hits."""
+    _log.info("[telemetry] " + msg, *args)
 
-def _env_falsy(v: Optional[str]) -> bool:
-    s = (v or "").strip().lower()
-    return s in ("0", "false", "no", "off", "n", "f")
+
+def _env_bool(v: Optional[str], default: Optional[bool] = None) -> Optional[bool]:
+    if v is None:
+        return default
+    return _BOOL_MAP.get(v.strip().lower(), default)
 
 
 def _env_opt_out() -> bool:
-    if _env_truthy(os.getenv(_OPTOUT_ENV_VAR)) or _env_truthy(
-        os.getenv("TELEMETRY_OPTOUT")
-    ):
-        return True
-    tel = os.getenv("TELEMETRY")
-    if tel is not None and _env_falsy(tel):
+    if _env_bool(os.getenv(_OPTOUT_ENV_VAR)) or _env_bool(os.getenv("TELEMETRY_OPTOUT")):
         return True
-    return False
+    return _env_bool(os.getenv("TELEMETRY")) is False
 
 
+# Opt-out is resolved lazily, once, like the other environment lookups: apps
+# often set os.environ (e.g. load_dotenv) after importing this module
+@functools.lru_cache(maxsize=1)
+def _opted_out() -> bool:
+    return _env_opt_out()
+
+
+def _recheck_optout() -> bool:
+    """Re-read the opt-out environment variables (for tests)."""
+    _opted_out.cache_clear()
+    return _opted_out()
+
+
+# Environment lookups are resolved once per process; see _reset_env_cache()
+@functools.lru_cache(maxsize=1)
 def _get_endpoint() -> str:
     ep = os.getenv("TELEMETRY_ENDPOINT") or _DEFAULT_ENDPOINT
     return ep
 
 
+@functools.lru_cache(maxsize=1)
 def _get_project_name() -> str:
     return _PROJECT_NAME
 
 
+@functools.lru_cache(maxsize=1)
 def _get_state_file() -> str:
     # Allow overriding the state file path for containerized deployments
     env_file = os.getenv("TELEMETRY_STATE_FILE")
     if env_file:
-        try:
-            _log.debug("telemetry state file (TELEMETRY_STATE_FILE) -> %s", env_file)
-        except Exception:
-            pass
+        _dbg("telemetry state file (TELEMETRY_STATE_FILE) -> %s", env_file)
         return env_file
     env_dir = os.getenv("TELEMETRY_STATE_DIR")
     if env_dir:
         p = os.path.join(env_dir, ".telemetry_id")
-        try:
-            _log.debug("telemetry state dir (TELEMETRY_STATE_DIR) -> %s", p)
-        except Exception:
-            pass
+        _dbg("telemetry state dir (TELEMETRY_STATE_DIR) -> %s", p)
         return p
-    return os.path.abspath(
-        os.path.join(os.path.dirname(__file__), "..", ".telemetry_id")
-    )
+    return os.path.join(_DEFAULT_STATE_DIR, ".telemetry_id")
+
+
+def _reset_env_cache() -> None:
+    """Forget cached environment lookups (for tests)."""
+    _recheck_optout()
+    _get_endpoint.cache_clear()
+    _get_project_name.cache_clear()
+    _get_state_file.cache_clear()
 
 
 def _ensure_instance_id() -> str:
+    global _CACHED_RAW_ID
+    if _CACHED_RAW_ID is None:
+        _CACHED_RAW_ID = _load_instance_id()
+    return _CACHED_RAW_ID
+
+
+def _load_instance_id() -> str:
+    global _ID_PERSISTED
     path = _get_state_file()
     try:
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as fh:
-                raw = fh.read().strip()
-                if raw:
-                    try:
-                        _log.debug("telemetry id file exists at %s", path)
-                    except Exception:
-                        pass
-                    return raw
-        new = str(uuid.uuid4())
-        # Ensure parent directory exists when using a custom path/dir
+        # Single open() instead of exists() + open(); a missing file falls through
         try:
-            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
-        except Exception:
+            with open(path, "rb") as fh:
+                raw, sent = _parse_state(fh.read())
+            if raw:
+                _dbg("telemetry id file exists at %s", path)
+                _LAST_SENT.update(sent)
+                _ID_PERSISTED = True
+                return raw
+        except FileNotFoundError:
+            pass
+        except OSError:
+            # Exists but unreadable; don't clobber the persisted id
+            _dbg("telemetry could not read id file at %s; using ephemeral id", path)
+            return uuid.uuid4().hex
+        new = uuid.uuid4().hex
+        # Ensure parent directory exists when using a custom path/dir
+        parent = os.path.dirname(path) or "."
+        if parent != _DEFAULT_STATE_DIR:
             try:
-                _log.debug("telemetry could not create parent dir for %s", path)
+                os.makedirs(parent, exist_ok=True)
             except Exception:
-                pass
+                _dbg("telemetry could not create parent dir for %s", path)
         with open(path, "w", encoding="utf-8") as fh:
-            fh.write(new)
-        try:
-            _log.debug("telemetry created id file at %s", path)
-        except Exception:
-            pass
+            fh.write(new + "\n")
+        _dbg("telemetry created id file at %s", path)
+        _ID_PERSISTED = True
         return new
     except Exception:
-        try:
-            _log.debug(
-                "telemetry failed to persist id file at %s; using ephemeral id", path
-            )
-        except Exception:
-            pass
-        return str(uuid.uuid4())
+        _dbg("telemetry failed to persist id file at %s; using ephemeral id", path)
+        return uuid.uuid4().hex
 
 
-def _hash_id(raw: str) -> str:
-    h = hashlib.sha256()
-    h.update(raw.encode("utf-8"))
-    return h.hexdigest()
+def _parse_state(data: bytes) -> tuple:
+    """Parse the state file into ``(id, {project: last UTC date sent})``.
+
+    Format: the id on the first line, then one ``<project> <YYYY-MM-DD>`` line per
+    project sharing the file. Legacy one-token date lines are ignored.
+    """
+    lines = [ln.strip() for ln in data.decode("ascii", "ignore").splitlines()]
+    lines = [ln for ln in lines if ln]
+    if not lines:
+        return "", {}
+    sent = {}
+    for ln in lines[1:]:
+        parts = ln.rsplit(None, 1)
+        if len(parts) == 2:
+            sent[parts[0]] = parts[1]
+    return lines[0], sent
 
 
-def _make_payload() -> dict:
+def _sent_today(today: str) -> bool:
+    # Keyed on project too: the server dedupes per (date, project, id) and several
+    # projects may share one state file
+    return _LAST_SENT.get(_get_project_name()) == today
+
+
+def _state_file_mode(path: str) -> int:
+    try:
+        return os.stat(path).st_mode & 0o777
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def _mark_sent(date: str) -> None:
+    """Record ``date`` as the last UTC day a ping was delivered for this project."""
+    project = _get_project_name()
+    if _LAST_SENT.get(project) == date:
+        return
+    _LAST_SENT[project] = date
     rid = _ensure_instance_id()
-    payload = {
-        "id": _hash_id(rid),
-        "date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
+    if not _ID_PERSISTED:
+        # Ephemeral id (state file unreadable/unwritable); never replace the persisted one
+        return
+    path = _get_state_file()
+    # Unique temp file: several processes (e.g. gunicorn workers) may share
+    # the state file and stamp it at the same boundary
+    # Merge in stamps other projects wrote since we loaded the file
+    sent = dict(_LAST_SENT)
+    try:
+        with open(path, "rb") as fh:
+            disk_id, disk_sent = _parse_state(fh.read())
+        if disk_id == rid:
+            sent = {**disk_sent, project: date}
+    except OSError:
+        pass
+    body = rid + "\n" + "".join(f"{proj} {d}\n" for proj, d in sent.items())
+    tmp = None
+    try:
+        fd, tmp = tempfile.mkstemp(
+            prefix=".telemetry_id.", suffix=".tmp", dir=os.path.dirname(path) or "."
+        )
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(body)
+        # mkstemp creates 0600; keep the file readable by whoever could read it before
+        os.chmod(tmp, _state_file_mode(path))
+        os.replace(tmp, path)
+    except Exception:
+        _dbg("telemetry could not record send date in %s", path)
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+
+def _hash_id(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _get_hashed_id() -> str:
+    global _CACHED_HASHED_ID
+    if _CACHED_HASHED_ID is None:
+        _CACHED_HASHED_ID = _hash_id(_ensure_instance_id().encode("ascii"))
+    return _CACHED_HASHED_ID
+
+
+def _today_utc_bytes() -> bytes:
+    # The date only changes at UTC midnight; key the cached value on the epoch day
+    global _DATE_EPOCH_DAY, _DATE_STR_BYTES
+    day = int(time.time()) // 86400
+    if day != _DATE_EPOCH_DAY:
+        _DATE_EPOCH_DAY = day
+        _DATE_STR_BYTES = time.strftime("%Y-%m-%d", time.gmtime(day * 86400)).encode("ascii")
+    return _DATE_STR_BYTES
+
+
+def _today_utc_str() -> str:
+    return _today_utc_bytes().decode("ascii")
+
+
+def _build_payload_template() -> None:
+    """Pre-encode the invariant parts of the payload around the date value."""
+    global _PAYLOAD_PREFIX, _PAYLOAD_SUFFIX
+    hid = json.dumps(_get_hashed_id())
+    proj = json.dumps(_get_project_name())
+    prefix = f'{{"id":{hid},"date":"'.encode("utf-8")
+    suffix = f'","projectname":{proj},"project":{proj},"count":1}}'.encode("utf-8")
+    date = _today_utc_str()
+    assert json.loads(prefix + date.encode("ascii") + suffix) == {
+        "id": _get_hashed_id(),
+        "date": date,
         "projectname": _get_project_name(),
         "project": _get_project_name(),
         "count": 1,
     }
-    return payload
+    _PAYLOAD_PREFIX, _PAYLOAD_SUFFIX = prefix, suffix
+
+
+def _build_payload_bytes() -> bytes:
+    if _PAYLOAD_PREFIX is None or _PAYLOAD_SUFFIX is None:
+        _build_payload_template()
+    return _PAYLOAD_PREFIX + _today_utc_bytes() + _PAYLOAD_SUFFIX
+
+
+@functools.lru_cache(maxsize=1)
+def _proxy_for(url: str) -> Optional[str]:
+    """Return the proxy urllib would use for ``url`` (HTTP(S)_PROXY/NO_PROXY), if any."""
+    parts = urllib.parse.urlsplit(url)
+    proxy = urllib.request.getproxies().get(parts.scheme)
+    if not proxy or urllib.request.proxy_bypass(parts.hostname or ""):
+        return None
+    return proxy
+
+
+def _get_pool(timeout: float, proxy: Optional[str] = None):
+    global _POOL
+    if _POOL is None:
+        kwargs = dict(
+            num_pools=1,
+            maxsize=1,
+            retries=False,
+            timeout=urllib3.Timeout(total=timeout),
+        )
+        # PoolManager ignores proxy env vars; honor them like urlopen did
+        if proxy:
+            _POOL = urllib3.ProxyManager(proxy, **kwargs)
+        else:
+            _POOL = urllib3.PoolManager(**kwargs)
+    return _POOL
+
+
+def _status_ok(url: str, status: int) -> bool:
+    # Only a delivered ping may be recorded as sent for the day; redirects are
+    # not followed on the pooled/raw connection paths, so 3xx is not delivered
+    if status >= 300:
+        _log.warning("[telemetry] POST failed (url=%s): HTTP %s", url, status)
+        return False
+    return True
 
 
 def _post_sync(url: str, data: bytes, timeout: float = 2.0) -> bool:
@@ -146,112 +360,212 @@ def _post_sync(url: str, data: bytes, timeout: float = 2.0) -> bool:
         "Content-Type": "application/json",
         "User-Agent": f"{_PROJECT_NAME}/telemetry",
     }
-    req = urllib.request.Request(url, data=data, headers=headers, method="POST")
-    try:
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            _ = resp.status
-            return True
-    except urllib.error.URLError as e:
+    if urllib3 is not None:
+        # Pooled connections are checked for being dropped before reuse
+        headers["Connection"] = "keep-alive"
         try:
+            pool = _get_pool(timeout, _proxy_for(url))
+            resp = pool.request("POST", url, body=data, headers=headers)
+            return _status_ok(url, resp.status)
+        except (urllib3.exceptions.HTTPError, OSError) as e:
             _log.warning("[telemetry] POST failed (url=%s): %s", url, e)
-        except Exception:
-            pass
-        return False
+            return False
+        except Exception as e:
+            _log.warning("[telemetry] POST failed (url=%s): %s", url, e)
+            return False
+    try:
+        if _proxy_for(url):
+            # Let urllib's ProxyHandler route proxied endpoints
+            req = urllib.request.Request(url, data=data, headers=headers, method="POST")
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                return _status_ok(url, resp.status)
+        return _status_ok(url, _post_http_client(url, data, headers, timeout))
     except Exception as e:
+        _log.warning("[telemetry] POST failed (url=%s): %s", url, e)
+        return False
+
+
+@functools.lru_cache(maxsize=1)
+def _split_endpoint(url: str) -> tuple:
+    """Parse ``url`` once into ``(scheme, host, port, path)``."""
+    parts = urllib.parse.urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    return parts.scheme, parts.hostname, parts.port, path
+
+
+def _post_http_client(url: str, data: bytes, headers: dict, timeout: float) -> int:
+    # Bypass urllib's opener stack (only used without a proxy) and reuse one
+    # keep-alive connection. The server usually drops it between 2h-apart
+    # sends, so a failure on a reused connection is retried once on a fresh
+    # one (the server dedupes per day).
+    global _CONN, _CONN_ADDR
+    scheme, host, port, path = _split_endpoint(url)
+    addr = (scheme, host, port)
+    if _CONN is not None and _CONN_ADDR != addr:
+        _CONN.close()
+        _CONN = None
+    while True:
+        reused = _CONN is not None
+        if _CONN is None:
+            if scheme == "https":
+                _CONN = http.client.HTTPSConnection(host, port, timeout=timeout)
+            else:
+                _CONN = http.client.HTTPConnection(host, port, timeout=timeout)
+            _CONN_ADDR = addr
         try:
-            _log.warning("[telemetry] POST failed (url=%s): %s", url, e)
-        except Exception:
-            pass
+            _CONN.request("POST", path, body=data, headers=headers)
+            resp = _CONN.getresponse()
+            resp.read()  # drain so the connection can be reused
+            return resp.status
+        except (http.client.HTTPException, OSError):
+            _CONN.close()
+            _CONN = None
+            if not reused:
+                raise
+
+
+def _post_and_mark(url: str, data: bytes, date: str) -> bool:
+    ok = _post_sync(url, data)
+    if ok:
+        _mark_sent(date)
+    return ok
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # One worker is plenty for a ping every 2 hours; avoids spinning up the
+    # loop's default executor (up to 32 threads) just for telemetry.
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="telemetry")
+        atexit.register(_EXECUTOR.shutdown, wait=False)
+    return _EXECUTOR
+
+
+async def _post_async(url: str, data: bytes, timeout: float = 2.0) -> bool:
+    headers = {
+        "Content-Type": "application/json",
+        "User-Agent": f"{_PROJECT_NAME}/telemetry",
+    }
+    # A session per send: pooling buys nothing at one ping every 2h, and a
+    # module-level session would outlive the caller's loop unclosed.
+    # trust_env keeps HTTP(S)_PROXY support.
+    try:
+        async with aiohttp.ClientSession(trust_env=True) as session:
+            async with session.post(
+                url,
+                data=data,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+            ) as resp:
+                return _status_ok(url, resp.status)
+    except Exception as e:
+        _log.warning("[telemetry] POST failed (url=%s): %s", url, e)
         return False
 
 
 async def maybe_send_telemetry_async() -> None:
     endpoint = _get_endpoint()
-    if not endpoint or _env_opt_out():
-        global _HAS_LOGGED_SKIP
-        try:
-            if not _HAS_LOGGED_SKIP:
-                _HAS_LOGGED_SKIP = True
-                _log.info(
-                    "[telemetry] skipped (endpoint_configured=%s, opted_out=%s)",
-                    bool(endpoint),
-                    _env_opt_out(),
-                )
-            else:
-                _log.debug(
-                    "telemetry skipped (endpoint=%s, opted_out=%s)",
-                    bool(endpoint),
-                    _env_opt_out(),
-                )
-        except Exception:
-            pass
+    if not endpoint or _opted_out():
+        _log_once(
+            "skipped (endpoint_configured=%s, opted_out=%s)",
+            bool(endpoint),
+            _opted_out(),
+        )
         return
     # Require explicit project name; skip if missing
     project = _get_project_name()
     if not project:
-        global _HAS_LOGGED_NO_PROJECT
-        try:
-            if not _HAS_LOGGED_NO_PROJECT:
-                _HAS_LOGGED_NO_PROJECT = True
-                _log.info("[telemetry] skipped (missing PROJECT_NAME)")
-            else:
-                _log.debug("telemetry skipped (missing PROJECT_NAME)")
-        except Exception:
-            pass
+        _log_once("skipped (missing PROJECT_NAME)")
         return
-    data = json.dumps(_make_payload(), separators=(",", ":")).encode("utf-8")
+    today = _today_utc_str()
     try:
         loop = asyncio.get_running_loop()
-        try:
-            _log.debug("telemetry POST -> %s (async, %d bytes)", endpoint, len(data))
-        except Exception:
-            pass
-        await loop.run_in_executor(None, _post_sync, endpoint, data)
+        if _CACHED_RAW_ID is None:
+            # First build reads (or creates) the id file; keep that disk I/O off the loop
+            data = await loop.run_in_executor(_get_executor(), _build_payload_bytes)
+        else:
+            data = _build_payload_bytes()
+        _dbg("telemetry POST -> %s (async, %d bytes)", endpoint, len(data))
+        if aiohttp is not None:
+            # Only hop to the executor when the stamp actually changes
+            if await _post_async(endpoint, data) and not _sent_today(today):
+                await loop.run_in_executor(_get_executor(), _mark_sent, today)
+        else:
+            await loop.run_in_executor(
+                _get_executor(), _post_and_mark, endpoint, data, today
+            )
     except Exception:
         return
 
 
-def _seconds_until_next_even_utc_hour() -> float:
-    """Return seconds until the next even UTC hour boundary (00,02,...,22).
+def _next_even_utc_hour_ts() -> int:
+    """Return the POSIX timestamp of the next even UTC hour boundary (00,02,...,22).
 
-    If called exactly at an even boundary, schedule for the next even boundary (i.e., +2h),
-    to avoid double-sending (startup + boundary).
+    If called exactly at an even boundary, the following boundary (i.e., +2h) is
+    returned, to avoid double-sending (startup + boundary).
     """
-    now = datetime.now(timezone.utc)
-    base = now.replace(minute=0, second=0, microsecond=0)
-    if now <= base:
-        # Exactly on the hour (or extremely close rounding down)
-        if base.hour % 2 == 0:
-            nxt = base + timedelta(hours=2)
-        else:
-            nxt = base + timedelta(hours=1)
-    else:
-        # After the hour; choose next even boundary
-        if base.hour % 2 == 0:
-            nxt = base + timedelta(hours=2)
-        else:
-            nxt = base + timedelta(hours=1)
-    delta = (nxt - now).total_seconds()
-    return max(1.0, delta)
+    period = _PERIOD_HOURS * 3600
+    return (int(time.time()) // period + 1) * period
+
+
+def _seconds_until_next_even_utc_hour() -> float:
+    """Return seconds until the next even UTC hour boundary (00,02,...,22)."""
+    return max(1.0, _next_even_utc_hour_ts() - time.time())
 
 
 async def _periodic_ping_loop() -> None:
     """Background loop that sends telemetry every 2 hours aligned to UTC even hours."""
     while True:
         try:
-            sleep_s = _seconds_until_next_even_utc_hour()
-            await asyncio.sleep(sleep_s)
-            if _env_opt_out():
+            target = _next_even_utc_hour_ts()
+            await asyncio.sleep(max(1.0, target - time.time()))
+            # The loop clock may wake us marginally early; don't fire (and
+            # compute the next boundary) before this one has actually passed.
+            remaining = target - time.time()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+            if _opted_out():
                 continue
             await maybe_send_telemetry_async()
-        except asyncio.CancelledError:
-            return
         except Exception:
-            # Swallow errors and continue; small backoff to avoid tight loop
-            try:
-                await asyncio.sleep(60)
-            except Exception:
-                return
+            # Swallow errors and continue; small backoff to avoid tight loop.
+            # Cancellation is not an Exception and propagates from either sleep.
+            _dbg("telemetry loop error", exc_info=True)
+            await asyncio.sleep(60)
+
+
+def _init_state_file() -> None:
+    # Ensure the local instance ID file exists early (also loads _LAST_SENT)
+    try:
+        path = _get_state_file()
+        _ = _ensure_instance_id()
+        _log.info("[telemetry] initialized state file at %s", path)
+    except Exception:
+        pass
+
+
+async def _startup_send() -> None:
+    """Initialize the state file off the loop, then send unless already covered."""
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(_get_executor(), _init_state_file)
+    except Exception:
+        pass
+    today = _today_utc_str()
+    # Near a boundary the periodic loop is about to send; let it, unless that
+    # boundary is UTC midnight and would carry tomorrow's date instead
+    dt = _seconds_until_next_even_utc_hour()
+    same_day = _next_even_utc_hour_ts() % 86400 != 0
+    if _sent_today(today):
+        # A restart on a day that was already counted doesn't need to ping again
+        _dbg("telemetry already sent for %s; skipping immediate send", today)
+    elif dt < _COALESCE_SECONDS and same_day:
+        _dbg("telemetry skipping immediate send; boundary send in %.0fs", dt)
+    else:
+        _dbg("telemetry sending immediately; next boundary in %.0fs", dt)
+        await maybe_send_telemetry_async()
 
 
 def maybe_send_telemetry_background() -> None:
@@ -259,53 +573,44 @@ def maybe_send_telemetry_background() -> None:
     if _HAS_SCHEDULED_SEND:
         return
     _HAS_SCHEDULED_SEND = True
-    # Ensure the local instance ID file exists early, even if opted out.
+    # Opted-out users never touch disk (nor the network via the sync fallback below).
+    if _opted_out():
+        _dbg("telemetry opted out; skipping state file init")
+        return
     try:
-        path = _get_state_file()
-        _ = _ensure_instance_id()
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # No running loop; the caller's thread may do the disk I/O itself
+        today = _today_utc_str()
+        _init_state_file()
+        # A restart on a day that was already counted doesn't need to ping again
+        if _sent_today(today):
+            _dbg("telemetry already sent for %s; skipping immediate send", today)
+            return
+        # No running loop; post from a daemon thread so the caller never blocks.
+        # Short-lived CLIs would exit before it runs, so exit waits for it, but
+        # only up to _EXIT_JOIN_SECONDS (socket timeouts don't bound DNS lookups).
+        _dbg("telemetry loop not running; sending from a background thread")
         try:
-            _log.info("[telemetry] initialized state file at %s", path)
+            th = threading.Thread(
+                target=_post_and_mark,
+                args=(_get_endpoint(), _build_payload_bytes(), today),
+                name="telemetry",
+                daemon=True,
+            )
+            th.start()
+            atexit.register(th.join, timeout=_EXIT_JOIN_SECONDS)
         except Exception:
             pass
-    except Exception:
-        pass
+        return
+    _log_once("scheduling immediate send and 2h periodic loop (UTC aligned)")
+    loop.create_task(_startup_send())
+    # Also schedule a periodic background ping aligned to UTC even hours (once per process)
     try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # Fire-and-forget immediate send
-            try:
-                global _HAS_LOGGED_SCHEDULE
-                if not _HAS_LOGGED_SCHEDULE:
-                    _HAS_LOGGED_SCHEDULE = True
-                    _log.info(
-                        "[telemetry] scheduling immediate send and 2h periodic loop (UTC aligned)"
-                    )
-                else:
-                    _log.debug("telemetry scheduling immediate send + periodic loop")
-            except Exception:
-                pass
-            asyncio.ensure_future(maybe_send_telemetry_async())
-            # Also schedule a periodic background ping aligned to UTC even hours (once per process)
-            try:
-                asyncio.ensure_future(_periodic_ping_loop())
-            except Exception:
-                # If scheduling fails, don't prevent the immediate send
-                pass
-        else:
-            # No running loop yet; perform a synchronous send now
-            try:
-                _log.debug("telemetry loop not running; sending synchronously")
-            except Exception:
-                pass
-            try:
-                _post_sync(_get_endpoint(), json.dumps(_make_payload()).encode("utf-8"))
-            except Exception:
-                pass
+        loop.create_task(_periodic_ping_loop())
     except Exception:
-        try:
-            _post_sync(_get_endpoint(), json.dumps(_make_payload()).encode("utf-8"))
-        except Exception:
-            pass
+        # If scheduling fails, don't prevent the immediate send
+        pass
 
 
 __all__ = ("maybe_send_telemetry_background", "maybe_send_telemetry_async")